@@ -5,19 +5,63 @@ A Model Context Protocol server for interacting with SharePoint Online
 """
 
 import asyncio
+import codecs
+import logging
 import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from email.message import Message
+from itertools import islice
+import orjson
 import requests
-from typing import Any, Dict, List, Optional
+from requests.adapters import HTTPAdapter
+from typing import Any, Dict, Iterator, List, Mapping, NamedTuple, Optional, Tuple
 from fastmcp import FastMCP
-from pydantic import BaseModel
+from urllib3.util.retry import Retry
 
-class SharePointConfig(BaseModel):
+logger = logging.getLogger(__name__)
+
+GRAPH_BASE_URL = "https://graph.microsoft.com/v1.0"
+GRAPH_BATCH_URL = GRAPH_BASE_URL + "/$batch"
+
+# Maximum number of sub-requests Graph accepts in a single $batch call
+GRAPH_BATCH_LIMIT = 20
+
+# driveItem fields requested for folder listings; everything else is left off the wire
+LISTING_FIELDS = "id,name,size,createdDateTime,lastModifiedDateTime,webUrl,folder,file,parentReference"
+
+# Listing responses are reused for this many seconds, then revalidated with If-None-Match
+RESPONSE_CACHE_TTL = 60
+RESPONSE_CACHE_SIZE = 256
+
+# MIME types whose content can be returned as text, with optional parameters such as charset
+_TEXT_MIME_RE = re.compile(r'^(?:text/|application/(?:json|xml|javascript|csv)(?:[;+].*)?$)', re.IGNORECASE)
+
+@dataclass(slots=True, frozen=True)
+class SharePointConfig:
     site_id: str
     client_id: str
     client_secret: str
     tenant_id: str
 
+class FileInfo(NamedTuple):
+    name: str
+    type: str
+    size: int
+    created: str
+    modified: str
+    id: str
+    webUrl: str
+    parentPath: str
+    mimeType: str
+
 class SharePointMCPServer:
+    # Constant tail of every children listing query: ordering and field projection
+    _CHILDREN_QS = "&$orderby=lastModifiedDateTime%20desc&$select=" + LISTING_FIELDS
+    
     def __init__(self):
         self.config = SharePointConfig(
             site_id=os.getenv("SHAREPOINT_SITE_ID", ""),
@@ -26,181 +70,330 @@ class SharePointMCPServer:
             tenant_id=os.getenv("SHAREPOINT_TENANT_ID", "")
         )
         self.access_token = None
+        self._token_expiry = 0.0
+        self._auth_headers: Dict[str, str] = {}
+        # Drive paths relative to the Graph root (as used in $batch) and absolute
+        self._site_path = f"/sites/{self.config.site_id}/drive"
+        self._site_base = GRAPH_BASE_URL + self._site_path
+        # Client credentials request for the v2.0 token endpoint; requests form-encodes the dict
+        self._token_url = f"https://login.microsoftonline.com/{self.config.tenant_id}/oauth2/v2.0/token"
+        self._token_request = {
+            'grant_type': 'client_credentials',
+            'client_id': self.config.client_id,
+            'client_secret': self.config.client_secret,
+            'scope': 'https://graph.microsoft.com/.default'
+        }
+        self.session = self._create_session()
+        # (connect, read) timeouts in seconds; downloads get a longer read window
+        self._timeout = (3.05, 30)
+        self._download_timeout = (3.05, 60)
+        # url -> (etag, parsed body, time stored), least recently used first
+        self._response_cache: OrderedDict[str, Tuple[Optional[str], Any, float]] = OrderedDict()
+        self._cache_lock = threading.Lock()
         
+    @staticmethod
+    def _create_session() -> requests.Session:
+        """Create a pooled HTTP session shared by all Graph and token requests"""
+        session = requests.Session()
+        retries = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=20, max_retries=retries)
+        session.mount("https://", adapter)
+        session.headers.update({'Content-Type': 'application/json'})
+        return session
+    
     def get_access_token(self) -> Optional[str]:
         """Get OAuth2 access token for SharePoint"""
         try:
-            resource = "https://graph.microsoft.com/"
-            grant_type = "client_credentials"
-            token_api = f"https://login.microsoftonline.com/{self.config.tenant_id}/oauth2/token"
-            
-            payload = f"grant_type={grant_type}&client_id={self.config.client_id}&client_secret={self.config.client_secret}&resource={resource}"
-            
+            # The form Content-Type must be explicit, otherwise the session's JSON default wins
             headers = {
                 'Content-Type': 'application/x-www-form-urlencoded'
             }
             
-            response = requests.post(token_api, data=payload, headers=headers, verify=True)
+            response = self.session.post(self._token_url, data=self._token_request, headers=headers, verify=True, timeout=self._timeout)
             response.raise_for_status()
             
-            token_data = response.json()
+            token_data = orjson.loads(response.content)
             self.access_token = token_data['access_token']
+            self._auth_headers = {'Authorization': f'Bearer {self.access_token}'}
+            # Refresh 5 minutes before the token actually expires
+            expires_in = int(token_data.get('expires_in', 3600))
+            self._token_expiry = time.monotonic() + expires_in - 300
             return self.access_token
             
-        except Exception as e:
-            print(f"Error getting access token: {e}")
+        except (requests.RequestException, KeyError, ValueError):
+            logger.exception("Error getting access token")
             return None
     
-    def get_site_files(self, max_files: int = 100, folder_id: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Get files from the SharePoint site with pagination and limits"""
-        if not self.access_token:
-            if not self.get_access_token():
-                return []
-        
+    def _ensure_token(self) -> Optional[str]:
+        """Return the cached access token, fetching a new one if it is missing or near expiry"""
+        if self.access_token and time.monotonic() < self._token_expiry:
+            return self.access_token
+        return self.get_access_token()
+    
+    def warm_up(self) -> None:
+        """Fetch a token and open a pooled Graph connection so the first tool call skips both handshakes"""
+        if not self.get_access_token():
+            logger.warning("Could not fetch an access token during warm-up")
+            return
         try:
-            headers = {
-                'Authorization': f'Bearer {self.access_token}',
-                'Content-Type': 'application/json'
-            }
-            
-            # Build URL based on whether we're looking at root or specific folder
-            if folder_id:
-                files_url = f"https://graph.microsoft.com/v1.0/sites/{self.config.site_id}/drive/items/{folder_id}/children"
-            else:
-                files_url = f"https://graph.microsoft.com/v1.0/sites/{self.config.site_id}/drive/root/children"
-            
-            # Add pagination and ordering
-            files_url += f"?$top={min(max_files, 100)}&$orderby=lastModifiedDateTime desc"
-            
-            files_response = requests.get(files_url, headers=headers)
-            files_response.raise_for_status()
-            
-            files_data = files_response.json()
-            files = []
-            
-            # Process files and folders (but don't recurse automatically)
-            for item in files_data.get('value', []):
-                file_info = {
-                    'name': item.get('name', ''),
-                    'type': 'folder' if 'folder' in item else 'file',
-                    'size': item.get('size', 0),
-                    'created': item.get('createdDateTime', ''),
-                    'modified': item.get('lastModifiedDateTime', ''),
-                    'id': item.get('id', ''),
-                    'webUrl': item.get('webUrl', ''),
-                    'parentPath': item.get('parentReference', {}).get('path', ''),
-                    'mimeType': item.get('file', {}).get('mimeType', '') if 'file' in item else ''
-                }
-                files.append(file_info)
-                
-                # Stop if we've reached the max files limit
-                if len(files) >= max_files:
-                    break
-            
-            return files
-            
-        except Exception as e:
-            print(f"Error getting site files: {e}")
-            return [{'error': f'Failed to retrieve files: {str(e)}'}]
+            response = self._graph_request('GET', self._site_base + "/root")
+            response.raise_for_status()
+        except requests.RequestException:
+            logger.warning("Could not reach Microsoft Graph during warm-up", exc_info=True)
     
-    def get_folder_contents(self, folder_id: str, max_files: int = 50) -> List[Dict[str, Any]]:
-        """Get contents of a specific folder"""
-        if not self.access_token:
-            if not self.get_access_token():
-                return []
+    def _graph_request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None, **kwargs) -> requests.Response:
+        """Send a Graph request with the current token, refreshing it once on a 401"""
+        kwargs.setdefault('timeout', self._timeout)
+        response = self.session.request(method, url, headers={**headers, **self._auth_headers} if headers else self._auth_headers, **kwargs)
+        if response.status_code == 401:
+            response.close()
+            self._token_expiry = 0.0
+            if self._ensure_token():
+                response = self.session.request(method, url, headers={**headers, **self._auth_headers} if headers else self._auth_headers, **kwargs)
+        return response
+    
+    def _get_json_cached(self, url: str) -> Dict[str, Any]:
+        """GET and parse a Graph URL, serving repeats from a short-lived LRU cache revalidated by ETag"""
+        with self._cache_lock:
+            entry = self._response_cache.get(url)
+            if entry:
+                self._response_cache.move_to_end(url)
         
-        try:
-            headers = {
-                'Authorization': f'Bearer {self.access_token}',
-                'Content-Type': 'application/json'
-            }
-            
-            folder_url = f"https://graph.microsoft.com/v1.0/sites/{self.config.site_id}/drive/items/{folder_id}/children"
-            folder_url += f"?$top={min(max_files, 100)}&$orderby=lastModifiedDateTime desc"
-            
-            response = requests.get(folder_url, headers=headers)
+        headers = {}
+        if entry:
+            etag, data, stored_at = entry
+            if time.monotonic() - stored_at < RESPONSE_CACHE_TTL:
+                return data
+            if etag:
+                headers['If-None-Match'] = etag
+        
+        response = self._graph_request('GET', url, headers=headers)
+        if response.status_code == 304 and entry:
+            etag = response.headers.get('ETag', etag)
+            data = entry[1]
+        else:
             response.raise_for_status()
-            
-            folder_data = response.json()
-            files = []
-            
-            for item in folder_data.get('value', []):
-                file_info = {
-                    'name': item.get('name', ''),
-                    'type': 'folder' if 'folder' in item else 'file',
-                    'size': item.get('size', 0),
-                    'created': item.get('createdDateTime', ''),
-                    'modified': item.get('lastModifiedDateTime', ''),
-                    'id': item.get('id', ''),
-                    'webUrl': item.get('webUrl', ''),
-                    'parentFolder': folder_id,
-                    'parentPath': item.get('parentReference', {}).get('path', ''),
-                    'mimeType': item.get('file', {}).get('mimeType', '') if 'file' in item else ''
-                }
-                files.append(file_info)
-                
-                if len(files) >= max_files:
+            etag = response.headers.get('ETag')
+            data = orjson.loads(response.content)
+        
+        with self._cache_lock:
+            self._response_cache[url] = (etag, data, time.monotonic())
+            self._response_cache.move_to_end(url)
+            while len(self._response_cache) > RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+        return data
+    
+    @staticmethod
+    def _file_info(item: Dict[str, Any]) -> FileInfo:
+        """Project a Graph driveItem onto the fields returned by the listing tools"""
+        file_field = item.get('file')
+        parent = item.get('parentReference')
+        return FileInfo(
+            name=item.get('name', ''),
+            type='folder' if 'folder' in item else 'file',
+            size=item.get('size', 0),
+            created=item.get('createdDateTime', ''),
+            modified=item.get('lastModifiedDateTime', ''),
+            id=item.get('id', ''),
+            webUrl=item.get('webUrl', ''),
+            parentPath=parent.get('path', '') if parent else '',
+            mimeType=file_field.get('mimeType', '') if file_field else ''
+        )
+    
+    def _children_url(self, parent_path: str, max_files: int) -> str:
+        """Build a children listing URL for a drive item path such as '/root' or '/items/{id}'"""
+        # Graph serves at most 100 items per page
+        return self._site_base + parent_path + "/children?$top=" + str(min(max_files, 100)) + self._CHILDREN_QS
+    
+    def _iter_children(self, url: str) -> Iterator[FileInfo]:
+        """Yield driveItems lazily, fetching the next @odata.nextLink page only when needed"""
+        while url:
+            page = self._get_json_cached(url)
+            for item in page.get('value', []):
+                yield self._file_info(item)
+            url = page.get('@odata.nextLink')
+    
+    def get_site_files(self, max_files: int = 100, folder_id: Optional[str] = None) -> Iterator[FileInfo]:
+        """Iterate over files in the SharePoint site; max_files sets the page size, so slice to limit"""
+        if not self._ensure_token():
+            return
+        
+        # Build URL based on whether we're looking at root or specific folder
+        parent_path = "/items/" + folder_id if folder_id else "/root"
+        
+        # Process files and folders (but don't recurse automatically)
+        yield from self._iter_children(self._children_url(parent_path, max_files))
+    
+    def get_folder_contents(self, folder_id: str, max_files: int = 50) -> Iterator[FileInfo]:
+        """Iterate over the contents of a specific folder; max_files sets the page size"""
+        if not self._ensure_token():
+            return
+        
+        yield from self._iter_children(self._children_url("/items/" + folder_id, max_files))
+    
+    @staticmethod
+    def _unreadable_reason(file_name: str, file_size: int, mime_type: str, max_size: int) -> Optional[str]:
+        """Return a message explaining why a file can't be read, or None if it can"""
+        # Check if file is too large
+        if file_size > max_size * 1024:  # max_size in KB
+            return f"File '{file_name}' is too large ({file_size} bytes). Maximum allowed size is {max_size}KB."
+        
+        # Check if file type is readable
+        if mime_type and not _TEXT_MIME_RE.match(mime_type):
+            return f"File '{file_name}' is a binary file ({mime_type}). Only text files can be read."
+        return None
+    
+    @staticmethod
+    def _decode_text(response: requests.Response, file_name: str, max_size: int) -> str:
+        """Decode a streamed download as text, reading only enough bytes for max_size characters"""
+        # A character takes at most 4 bytes in UTF-8, so this always covers max_size characters
+        max_bytes = 4 * max_size
+        try:
+            chunks = []
+            received = 0
+            truncated = False
+            for chunk in response.iter_content(chunk_size=8192):
+                chunks.append(chunk)
+                received += len(chunk)
+                if received > max_bytes:
+                    truncated = True
                     break
-                    
-            return files
-            
-        except Exception as e:
-            print(f"Error getting folder contents: {e}")
-            return [{'error': f'Failed to retrieve folder contents: {str(e)}'}]
+        finally:
+            response.close()
+        
+        # An incremental decoder keeps a multi-byte character split by truncation from raising
+        try:
+            decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')()
+        except LookupError:
+            # Unknown charset from the server; UTF-8 is the most likely actual encoding
+            decoder = codecs.getincrementaldecoder('utf-8')()
+        try:
+            content = decoder.decode(b''.join(chunks), final=not truncated)
+        except UnicodeDecodeError:
+            return f"File '{file_name}' contains binary data that cannot be displayed as text."
+        
+        # Truncate if still too long, or note that bytes were left unread
+        if len(content) > max_size or truncated:
+            content = content[:max_size] + f"\n\n... (truncated, showing first {max_size} characters)"
+        return content
     
     def get_file_content(self, file_id: str, max_size: int = 5000) -> Optional[str]:
         """Get content of a specific file with size limits"""
-        if not self.access_token:
-            if not self.get_access_token():
-                return None
+        if not self._ensure_token():
+            return None
         
         try:
-            # First get file metadata to check size
-            file_info_url = f"https://graph.microsoft.com/v1.0/sites/{self.config.site_id}/drive/items/{file_id}"
-            headers = {
-                'Authorization': f'Bearer {self.access_token}',
-                'Content-Type': 'application/json'
-            }
+            # Stream the content directly and gate on the response headers instead of a separate metadata request
+            file_url = f"{self._site_base}/items/{file_id}/content"
             
-            info_response = requests.get(file_info_url, headers=headers)
-            info_response.raise_for_status()
-            
-            file_info = info_response.json()
-            file_size = file_info.get('size', 0)
-            file_name = file_info.get('name', 'unknown')
-            mime_type = file_info.get('file', {}).get('mimeType', '')
-            
-            # Check if file is too large
-            if file_size > max_size * 1024:  # max_size in KB
-                return f"File '{file_name}' is too large ({file_size} bytes). Maximum allowed size is {max_size}KB."
+            response = self._graph_request('GET', file_url, stream=True, timeout=self._download_timeout)
+            response.raise_for_status()
             
-            # Check if file type is readable
-            text_types = ['text/', 'application/json', 'application/xml', 'application/javascript', 'application/csv']
-            if mime_type and not any(text_type in mime_type for text_type in text_types):
-                return f"File '{file_name}' is a binary file ({mime_type}). Only text files can be read."
+            # A compressed body's Content-Length is not the file size; _decode_text still caps the decoded bytes
+            file_size = 0 if response.headers.get('Content-Encoding') else int(response.headers.get('Content-Length', 0))
+            mime_type = response.headers.get('Content-Type', '')
+            file_name = self._filename_from_headers(response.headers) or file_id
             
-            # Get file content
-            file_url = f"https://graph.microsoft.com/v1.0/sites/{self.config.site_id}/drive/items/{file_id}/content"
-            headers = {
-                'Authorization': f'Bearer {self.access_token}'
-            }
+            unreadable = self._unreadable_reason(file_name, file_size, mime_type, max_size)
+            if unreadable:
+                response.close()
+                return unreadable
             
-            response = requests.get(file_url, headers=headers)
-            response.raise_for_status()
-            
-            # Try to decode as text
-            try:
-                content = response.text
-                # Truncate if still too long
-                if len(content) > max_size:
-                    content = content[:max_size] + f"\n\n... (truncated, showing first {max_size} characters)"
-                return content
-            except UnicodeDecodeError:
-                return f"File '{file_name}' contains binary data that cannot be displayed as text."
+            return self._decode_text(response, file_name, max_size)
                 
-        except Exception as e:
-            print(f"Error getting file content: {e}")
+        except (requests.RequestException, KeyError, ValueError) as e:
+            logger.exception("Error getting file content")
             return f"Error retrieving file content: {str(e)}"
+    
+    @staticmethod
+    def _filename_from_headers(headers: Mapping[str, str]) -> Optional[str]:
+        """Extract the file name from a Content-Disposition header, if present"""
+        disposition = headers.get('Content-Disposition')
+        if not disposition:
+            return None
+        message = Message()
+        message['Content-Disposition'] = disposition
+        return message.get_filename()
+    
+    def _graph_batch(self, batch_requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """POST up to 20 sub-requests to the Graph $batch endpoint and return their responses"""
+        response = self._graph_request('POST', GRAPH_BATCH_URL, data=orjson.dumps({'requests': batch_requests}))
+        response.raise_for_status()
+        return orjson.loads(response.content).get('responses', [])
+    
+    def _download_text(self, download_url: str, file_name: str, max_size: int) -> str:
+        """Download a file from its pre-authenticated URL and decode it as text"""
+        response = self.session.get(download_url, stream=True, timeout=self._download_timeout)
+        response.raise_for_status()
+        return self._decode_text(response, file_name, max_size)
+    
+    async def get_files_content_batch(self, file_ids: List[str], max_size: int = 5000) -> Dict[str, str]:
+        """Get content of several files, fetching their metadata through Graph $batch"""
+        if not await asyncio.to_thread(self._ensure_token):
+            return {}
+        
+        # Graph accepts at most 20 sub-requests per batch; independent batches run concurrently
+        chunks = [file_ids[start:start + GRAPH_BATCH_LIMIT] for start in range(0, len(file_ids), GRAPH_BATCH_LIMIT)]
+        batch_results = await asyncio.gather(*(
+            asyncio.to_thread(self._graph_batch, [
+                {'id': str(i), 'method': 'GET', 'url': f"{self._site_path}/items/{file_id}"}
+                for i, file_id in enumerate(chunk)
+            ])
+            for chunk in chunks
+        ), return_exceptions=True)
+        
+        contents = {}
+        downloads = {}
+        for chunk, item_responses in zip(chunks, batch_results):
+            # A failed batch only affects the files in its own chunk
+            if isinstance(item_responses, (requests.RequestException, KeyError, ValueError)):
+                logger.error("Error getting files content", exc_info=item_responses)
+                for file_id in chunk:
+                    contents[file_id] = f"Error retrieving file content: {str(item_responses)}"
+                continue
+            if isinstance(item_responses, BaseException):
+                raise item_responses
+            
+            chunk_ids = {str(i): file_id for i, file_id in enumerate(chunk)}
+            for item_response in item_responses:
+                file_id = chunk_ids.get(item_response.get('id'))
+                if file_id is None:
+                    continue
+                file_info = item_response.get('body', {})
+                if item_response.get('status') != 200:
+                    message = file_info.get('error', {}).get('message', 'unknown error')
+                    contents[file_id] = f"Error retrieving file content: {message}"
+                    continue
+                
+                file_name = file_info.get('name', 'unknown')
+                download_url = file_info.get('@microsoft.graph.downloadUrl')
+                # Folders and other non-file items have no file facet or download URL
+                if 'file' not in file_info or not download_url:
+                    contents[file_id] = f"'{file_name}' is not a readable file."
+                    continue
+                
+                unreadable = self._unreadable_reason(
+                    file_name, file_info.get('size', 0), file_info.get('file', {}).get('mimeType', ''), max_size
+                )
+                if unreadable:
+                    contents[file_id] = unreadable
+                    continue
+                
+                # The pre-authenticated download URL saves a second batch of /content redirects
+                downloads[file_id] = (download_url, file_name)
+        
+        # Download all readable files concurrently
+        results = await asyncio.gather(
+            *(asyncio.to_thread(self._download_text, url, name, max_size) for url, name in downloads.values()),
+            return_exceptions=True
+        )
+        for file_id, result in zip(downloads, results):
+            if isinstance(result, Exception):
+                logger.error("Error getting file content", exc_info=result)
+                result = f"Error retrieving file content: {str(result)}"
+            contents[file_id] = result
+        
+        return contents
 
 # Initialize the SharePoint server
 sharepoint_server = SharePointMCPServer()
@@ -208,8 +401,12 @@ sharepoint_server = SharePointMCPServer()
 # Create FastMCP instance
 mcp = FastMCP("SharePoint MCP Server")
 
+def _collect_files(files: Iterator[FileInfo], max_files: int, **extra: Any) -> List[Dict[str, Any]]:
+    """Consume at most max_files listing entries and convert them to dicts for the MCP response"""
+    return [{**file_info._asdict(), **extra} for file_info in islice(files, max_files)]
+
 @mcp.tool()
-def list_sharepoint_files(max_files: int = 50, folder_id: Optional[str] = None) -> List[Dict[str, Any]]:
+async def list_sharepoint_files(max_files: int = 50, folder_id: Optional[str] = None) -> List[Dict[str, Any]]:
     """
     List files in the SharePoint site with pagination.
     
@@ -223,10 +420,14 @@ def list_sharepoint_files(max_files: int = 50, folder_id: Optional[str] = None)
     # Limit max_files to prevent overwhelming responses
     max_files = min(max_files, 100)
     files = sharepoint_server.get_site_files(max_files=max_files, folder_id=folder_id)
-    return files
+    try:
+        return await asyncio.to_thread(_collect_files, files, max_files)
+    except (requests.RequestException, KeyError, ValueError) as e:
+        logger.exception("Error getting site files")
+        return [{'error': f'Failed to retrieve files: {str(e)}'}]
 
 @mcp.tool()
-def get_folder_contents(folder_id: str, max_files: int = 50) -> List[Dict[str, Any]]:
+async def get_folder_contents(folder_id: str, max_files: int = 50) -> List[Dict[str, Any]]:
     """
     Get contents of a specific SharePoint folder.
     
@@ -238,10 +439,15 @@ def get_folder_contents(folder_id: str, max_files: int = 50) -> List[Dict[str, A
         List of files and subfolders in the specified folder.
     """
     max_files = min(max_files, 100)
-    return sharepoint_server.get_folder_contents(folder_id, max_files)
+    files = sharepoint_server.get_folder_contents(folder_id, max_files)
+    try:
+        return await asyncio.to_thread(_collect_files, files, max_files, parentFolder=folder_id)
+    except (requests.RequestException, KeyError, ValueError) as e:
+        logger.exception("Error getting folder contents")
+        return [{'error': f'Failed to retrieve folder contents: {str(e)}'}]
 
 @mcp.tool()
-def get_sharepoint_file_content(file_id: str, max_size_kb: int = 5) -> Optional[str]:
+async def get_sharepoint_file_content(file_id: str, max_size_kb: int = 5) -> Optional[str]:
     """
     Get the content of a specific SharePoint file.
     
@@ -254,18 +460,33 @@ def get_sharepoint_file_content(file_id: str, max_size_kb: int = 5) -> Optional[
     """
     # Limit max size to prevent overwhelming responses
     max_size_kb = min(max_size_kb, 50)
-    content = sharepoint_server.get_file_content(file_id, max_size_kb * 1024)
+    content = await asyncio.to_thread(sharepoint_server.get_file_content, file_id, max_size_kb * 1024)
     return content
 
 @mcp.tool()
-def test_sharepoint_connection() -> Dict[str, Any]:
+async def get_sharepoint_files_content(file_ids: List[str], max_size_kb: int = 5) -> Dict[str, str]:
+    """
+    Get the content of several SharePoint files in one call.
+    
+    Args:
+        file_ids: The IDs of the files to retrieve content for
+        max_size_kb: Maximum file size in KB to read per file (default: 5KB, max: 50KB)
+        
+    Returns:
+        Mapping of file ID to file content as text (or a message if it can't be read)
+    """
+    max_size_kb = min(max_size_kb, 50)
+    return await sharepoint_server.get_files_content_batch(file_ids, max_size_kb * 1024)
+
+@mcp.tool()
+async def test_sharepoint_connection() -> Dict[str, Any]:
     """
     Test the connection to SharePoint by attempting to get an access token.
     
     Returns:
         Connection status and configuration info
     """
-    token = sharepoint_server.get_access_token()
+    token = await asyncio.to_thread(sharepoint_server.get_access_token)
     return {
         "connected": token is not None,
         "site_id": sharepoint_server.config.site_id,
@@ -275,14 +496,21 @@ def test_sharepoint_connection() -> Dict[str, Any]:
     }
 
 if __name__ == "__main__":
+    # Log to stderr so stdout stays reserved for the MCP stdio transport
+    logging.basicConfig(level=logging.INFO)
+    
     # Check if environment variables are set
     required_vars = ["SHAREPOINT_SITE_ID", "SHAREPOINT_CLIENT_ID", "SHAREPOINT_CLIENT_SECRET", "SHAREPOINT_TENANT_ID"]
     missing_vars = [var for var in required_vars if not os.getenv(var)]
     
     if missing_vars:
-        print(f"Missing required environment variables: {', '.join(missing_vars)}")
-        print("Please set these environment variables before running the server.")
+        logger.error("Missing required environment variables: %s", ', '.join(missing_vars))
+        logger.error("Please set these environment variables before running the server.")
         exit(1)
     
+    # Pay the token and connection setup before the first tool call, in the background so a
+    # slow or throttled Graph endpoint can't hold up the MCP initialize handshake
+    threading.Thread(target=sharepoint_server.warm_up, name="sharepoint-warm-up", daemon=True).start()
+    
     # Run the server
     mcp.run()
\ No newline at end of file